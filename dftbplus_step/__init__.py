@@ -5,54 +5,61 @@ dftbplus_step
 A step for DFTB+ in a SEAMM flowchart
 """
 
-# Bring up the classes so that they appear to be directly in
-# the dftbplus_step package.
-
-# Main classes
-from dftbplus_step.dftbplus import Dftbplus, deep_merge, dict_to_hsd  # noqa: F401
-from dftbplus_step.dftbplus_parameters import DftbplusParameters  # noqa: F401
-from dftbplus_step.dftbplus_step import DftbplusStep  # noqa: F401
-from dftbplus_step.tk_dftbplus import TkDftbplus  # noqa: F401
+import importlib
 
-# The metadata
 from dftbplus_step.metadata import metadata  # noqa: F401
+from ._version import get_versions
+from .computational_models import computational_models_metadata
 
-# The substeps
-from dftbplus_step.choose_parameters import ChooseParameters  # noqa: F401
-from dftbplus_step.choose_parameters_parameters import (  # noqa: F401
-    ChooseParametersParameters,
-)
-from dftbplus_step.choose_parameters_step import (  # noqa: F401
-    ChooseParametersStep,
-)
-from dftbplus_step.tk_choose_parameters import TkChooseParameters  # noqa: F401
+# Bring up the classes so that they appear to be directly in
+# the dftbplus_step package. The modules are imported lazily, on first
+# access, so that e.g. the installer does not pull in the GUI, numpy,
+# pandas and seekpath.
+_lazy_imports = {
+    # Main classes
+    "Dftbplus": "dftbplus",
+    "deep_merge": "dftbplus",
+    "dict_to_hsd": "dftbplus",
+    "DftbplusParameters": "dftbplus_parameters",
+    "DftbplusStep": "dftbplus_step",
+    "TkDftbplus": "tk_dftbplus",
+    # The substeps
+    "ChooseParameters": "choose_parameters",
+    "ChooseParametersParameters": "choose_parameters_parameters",
+    "ChooseParametersStep": "choose_parameters_step",
+    "TkChooseParameters": "tk_choose_parameters",
+    "Energy": "energy",
+    "EnergyParameters": "energy_parameters",
+    "EnergyStep": "energy_step",
+    "TkEnergy": "tk_energy",
+    "Optimization": "optimization",
+    "OptimizationParameters": "optimization_parameters",
+    "OptimizationStep": "optimization_step",
+    "TkOptimization": "tk_optimization",
+    "BandStructure": "band_structure",
+    "BandStructureParameters": "band_structure_parameters",
+    "BandStructureStep": "band_structure_step",
+    "TkBandStructure": "tk_band_structure",
+    "DOS": "dos",
+    "DOSParameters": "dos_parameters",
+    "DOSStep": "dos_step",
+    "TkDOS": "tk_dos",
+}
 
-from dftbplus_step.energy import Energy  # noqa: F401
-from dftbplus_step.energy_parameters import EnergyParameters  # noqa: F401
-from dftbplus_step.energy_step import EnergyStep  # noqa: F401
-from dftbplus_step.tk_energy import TkEnergy  # noqa: F401
 
-from dftbplus_step.optimization import Optimization  # noqa: F401
-from dftbplus_step.optimization_parameters import (  # noqa: F401
-    OptimizationParameters,
-)
-from dftbplus_step.optimization_step import OptimizationStep  # noqa: F401
-from dftbplus_step.tk_optimization import TkOptimization  # noqa: F401
+def __getattr__(name):
+    """Import the classes on first access (PEP 562)."""
+    if name not in _lazy_imports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{_lazy_imports[name]}")
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
 
-from dftbplus_step.band_structure import BandStructure  # noqa: F401
-from dftbplus_step.band_structure_parameters import (  # noqa: F401
-    BandStructureParameters,
-)
-from dftbplus_step.band_structure_step import BandStructureStep  # noqa: F401
-from dftbplus_step.tk_band_structure import TkBandStructure  # noqa: F401
 
-from dftbplus_step.dos import DOS  # noqa: F401
-from dftbplus_step.dos_parameters import DOSParameters  # noqa: F401
-from dftbplus_step.dos_step import DOSStep  # noqa: F401
-from dftbplus_step.tk_dos import TkDOS  # noqa: F401
+def __dir__():
+    return sorted([*globals(), *_lazy_imports])
 
-from ._version import get_versions
-from .computational_models import computational_models_metadata
 
 # Get the computational model metadata from the parameters
 metadata["computational models"] = computational_models_metadata()
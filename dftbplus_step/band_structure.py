@@ -2,6 +2,7 @@
 
 """Setup DFTB+"""
 
+import functools
 import logging
 from pathlib import Path
 import textwrap
@@ -24,6 +25,10 @@ logger = logging.getLogger(__name__)
 job = printing.getPrinter()
 printer = printing.getPrinter("DFTB+")
 
+# Formats for the lines of the Klines block and the coordinates along the path
+kline_format = "%4d %7.4f %7.4f %7.4f   # %s"
+point_format = "%6.3f %6.3f %6.3f"
+
 
 def fix_label(label):
     "Convert a label such as GAMMA to the greek letter."
@@ -33,13 +38,29 @@ def fix_label(label):
         return label
 
 
+@functools.lru_cache(maxsize=32)
+def _seekpath(lattice, fractionals, atomic_numbers):
+    """Cached call to seekpath.get_path, which does a full symmetry analysis.
+
+    The arguments must be hashable, so are tuples rather than lists or arrays.
+    """
+    return seekpath.get_path(
+        (lattice, fractionals, atomic_numbers), with_time_reversal=True
+    )
+
+
+def _interpolate_segment(start, delta, n):
+    """The n points start + delta, start + 2 * delta, ... along a segment."""
+    return start + np.arange(1, n + 1)[:, np.newaxis] * delta
+
+
 class BandStructure(DftbBase):
     def __init__(
         self, flowchart=None, title="Band Structure", extension=None, logger=logger
     ):
         """Initialize the node"""
 
-        logger.debug("Creating BandStructure {}".format(self))
+        logger.debug("Creating BandStructure %s", self)
 
         super().__init__(flowchart=flowchart, title=title, extension=extension)
 
@@ -127,10 +148,13 @@ class BandStructure(DftbBase):
         }
         return result
 
-    def analyze(self, indent="", data={}, out=[]):
+    def analyze(self, indent="", data=None, out=None):
         """Parse the output and generating the text output and store the
         data in variables for other stages to access
         """
+        if data is None:
+            data = {}
+
         # Print the key results
         text = "Prepared the band structure graph."
 
@@ -154,11 +178,14 @@ class BandStructure(DftbBase):
             energy_id = int(self.energy_step._id[-1])
             if dos_id < energy_id:
                 step = self.energy_step
-        dos_path = Path(step.directory) / "DOS.csv"
-        if dos_path.exists():
-            DOS = pandas.read_csv(dos_path, index_col=0)
-        else:
-            DOS = None
+        # Use the DOS already in memory if possible, rather than rereading it.
+        DOS = step.dos_data
+        if DOS is None:
+            dos_path = Path(step.directory) / "DOS.parquet"
+            if dos_path.exists():
+                DOS = pandas.read_parquet(dos_path)
+            elif dos_path.with_suffix(".csv").exists():
+                DOS = pandas.read_csv(dos_path.with_suffix(".csv"), index_col=0)
 
         wd = Path(self.directory)
         self.band_structure(
@@ -185,67 +212,54 @@ class BandStructure(DftbBase):
         cell_data = configuration.primitive_cell()
 
         # Get the lines
-        seekpath_output = seekpath.get_path(cell_data[0:3], with_time_reversal=True)
-
-        # Get the total length of the path.
-        total_length = 0.0
-        for start_label, stop_label in seekpath_output["path"]:
-            start_coord = np.array(seekpath_output["point_coords"][start_label])
-            stop_coord = np.array(seekpath_output["point_coords"][stop_label])
-            start_coord_abs = np.dot(
-                start_coord, seekpath_output["reciprocal_primitive_lattice"]
-            )
-            stop_coord_abs = np.dot(
-                stop_coord, seekpath_output["reciprocal_primitive_lattice"]
-            )
-            segment_length = np.linalg.norm(stop_coord_abs - start_coord_abs)
-            total_length += segment_length
+        lattice, fractionals, atomic_numbers = cell_data[0:3]
+        seekpath_output = _seekpath(
+            tuple(map(tuple, np.round(lattice, 8).tolist())),
+            tuple(map(tuple, np.round(fractionals, 8).tolist())),
+            tuple(atomic_numbers),
+        )
+
+        # Get the length of each segment and the total length of the path.
+        point_coords = seekpath_output["point_coords"]
+        start_labels, stop_labels = zip(*seekpath_output["path"])
+        B = np.array(seekpath_output["reciprocal_primitive_lattice"])
+        starts = np.array([point_coords[label] for label in start_labels], dtype=float)
+        stops = np.array([point_coords[label] for label in stop_labels], dtype=float)
+        segment_lengths = np.linalg.norm((stops - starts) @ B, axis=1)
+        total_length = segment_lengths.sum()
 
         # And extra points needed -- 1 at start, and one at each break
-        last_label = ""
-        extra_points = 0
-        for start_label, stop_label in seekpath_output["path"]:
-            if start_label != last_label:
-                extra_points += 1
-            last_label = stop_label
+        breaks = [True]
+        breaks.extend(
+            start != last for start, last in zip(start_labels[1:], stop_labels[:-1])
+        )
+        extra_points = sum(breaks)
 
         n = nPoints - extra_points
         result = []
-        last_label = ""
         total = 0
         self.sym_points = points = []
         self.sym_labels = labels = []
         self.path = path = []
-        for start_label, stop_label in seekpath_output["path"]:
-            start_coord = np.array(seekpath_output["point_coords"][start_label])
-            stop_coord = np.array(seekpath_output["point_coords"][stop_label])
-
-            start_coord_abs = np.dot(
-                start_coord, seekpath_output["reciprocal_primitive_lattice"]
-            )
-            stop_coord_abs = np.dot(
-                stop_coord, seekpath_output["reciprocal_primitive_lattice"]
-            )
-            segment_length = np.linalg.norm(stop_coord_abs - start_coord_abs)
-
+        for start_label, stop_label, start_coord, stop_coord, length, new_line in zip(
+            start_labels, stop_labels, starts, stops, segment_lengths, breaks
+        ):
             # See if we needed an added point at the start
-            if start_label != last_label:
-                x, y, z = start_coord.tolist()
-                result.append(f"   1 {x:7.4f} {y:7.4f} {z:7.4f}   # {start_label}")
+            if new_line:
+                xyz = tuple(start_coord.tolist())
+                result.append(kline_format % (1, *xyz, start_label))
                 total += 1
                 points.append(total)
                 labels.append(fix_label(start_label))
-                path.append(f"{x:6.3f} {y:6.3f} {z:6.3f}")
-            last_label = stop_label
+                path.append(point_format % xyz)
 
-            num_points = max(2, int(round(n * segment_length / total_length)))
-            x, y, z = stop_coord.tolist()
-            result.append(f"{num_points:4} {x:7.4f} {y:7.4f} {z:7.4f}   # {stop_label}")
+            num_points = max(2, int(round(n * length / total_length)))
+            result.append(kline_format % (num_points, *stop_coord.tolist(), stop_label))
             delta = (stop_coord - start_coord) / num_points
-            for i in range(num_points):
-                start_coord += delta
-                x, y, z = start_coord.tolist()
-                path.append(f"{x:6.3f} {y:6.3f} {z:6.3f}")
+            path.extend(
+                point_format % tuple(xyz)
+                for xyz in _interpolate_segment(start_coord, delta, num_points).tolist()
+            )
 
             total += num_points
             points.append(total)
@@ -3,14 +3,19 @@
 """Non-graphical part of the DFTB+ step in a SEAMM flowchart
 """
 
-import configparser
-import copy
+import collections
+import functools
+import hashlib
+import io
+import json
 import logging
+import os
 from pathlib import Path
 import pprint
+import re
 import shutil
-import traceback
 
+import numpy as np
 import pandas
 
 import cms_plots
@@ -33,10 +38,19 @@ logger = logging.getLogger(__name__)
 job = printing.getPrinter()
 printer = printing.getPrinter("DFTB+")
 
+# The partial DOS files from DFTB+, e.g. "pdos_Ga.1.out" for the s shell of Ga
+pdos_filename = re.compile(r"pdos_([^.]+)\.\d+\.out")
+
+# The header of an item in results.tag, e.g. "forces   :real:2:3,2"
+tag_header = re.compile(r"^([^#\n][^:\n]*):([^:\n]*):[ \t]*(\d+):(.*)$", re.MULTILINE)
+
 
 def redimension(values, dimensions):
     """Change the dimensions on values to the new dimensions.
 
+    The values are in Fortran order, i.e. the first index varies fastest, so the
+    last dimension is the outermost list.
+
     Parameters
     ----------
     values : []
@@ -50,35 +64,65 @@ def redimension(values, dimensions):
         The redimensioned values.
     """
     # Check that the number of values is OK
-    nvalues = 1
-    for dim in dimensions:
-        nvalues *= dim
+    nvalues = int(np.prod(dimensions))
     if len(values) != nvalues:
         raise ValueError(
             f"Number of values given, {len(values)}, is not equal to the "
             f"dimensions: {dimensions} --> {nvalues} values"
         )
-    try:
-        _, result = _redimension_helper(values, dimensions)
-    except Exception as e:
-        print(f"Exception in redimension {type(e)}: {e}")
-        print(traceback.format_exc())
-        raise
 
-    return result
+    # Vectors, such as the charges, need no reshaping
+    if len(dimensions) == 1:
+        return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+    return np.asarray(values).reshape(dimensions[::-1]).tolist()
+
 
+def format_atoms(types, coordinates, fmt):
+    """Format the lines of a TypesAndCoordinates block in DFTB+ input.
 
-def _redimension_helper(values, dimensions):
-    dim = dimensions[-1]
-    remaining = dimensions[0:-1]
-    if len(remaining) == 0:
-        return values[dim:], values[0:dim]
-    else:
-        result = []
-        for i in range(dim):
-            values, tmp = _redimension_helper(values, remaining)
-            result.append(tmp)
-    return values, result
+    Parameters
+    ----------
+    types : [int]
+        The index of the type (element) of each atom, starting at 1.
+    coordinates : [[float]*3]
+        The coordinates of the atoms.
+    fmt : str
+        The format for each coordinate, e.g. "%10.6f"
+
+    Returns
+    -------
+    str
+        The lines, without a trailing newline.
+    """
+    table = np.column_stack((types, coordinates))
+    buffer = io.StringIO()
+    np.savetxt(buffer, table, fmt=f"        %2d {fmt} {fmt} {fmt}")
+    return buffer.getvalue().rstrip("\n")
+
+
+def read_table(path, index_dtype=float):
+    """Read a table of numbers written by the DFTB+ tools, e.g. dp_dos.
+
+    Parameters
+    ----------
+    path : filename or pathlib.Path
+        The file to read. Lines starting with "!" are comments.
+    index_dtype : type = float
+        The type of the first column, which is used as the index.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The data indexed by the first column, with the remaining columns
+        labeled 1, 2, ..., as from pandas.read_csv with header=None.
+    """
+    data = np.loadtxt(path, comments="!", ndmin=2)
+    return pandas.DataFrame(
+        data[:, 1:],
+        index=pandas.Index(data[:, 0].astype(index_dtype), name=0),
+        columns=range(1, data.shape[1]),
+    )
 
 
 class DftbBase(seamm.Node):
@@ -90,6 +134,7 @@ class DftbBase(seamm.Node):
         self.mapping_from_primitive = None
         self.mapping_to_primitive = None
         self.results = None  # Results of the calculation from the tag file.
+        self.dos_data = None  # The DOS as a DataFrame, if it was calculated.
 
         super().__init__(flowchart=flowchart, title=title, extension=extension)
 
@@ -122,6 +167,9 @@ class DftbBase(seamm.Node):
         path : filename or pathlib.Path
             The path to the band output from DFTB+.
         """
+        wd = Path(self.directory)
+        write_html = self.parent.options.get("html", False)
+
         Band_Structure = self.create_band_structure_data(  # noqa: F841
             input_path, sym_points, sym_names, Efermi=Efermi
         )
@@ -131,11 +179,8 @@ class DftbBase(seamm.Node):
         )
 
         # Write it out.
-        wd = Path(self.directory)
         figure.dump(wd / "band_structure.graph")
 
-        options = self.parent.options
-        write_html = "html" in options and options["html"]
         if write_html:
             figure.template = "band_structure.html_template"
             figure.dump(wd / "band_structure.html")
@@ -151,102 +196,44 @@ class DftbBase(seamm.Node):
             The path to the band output from DFTB+.
         """
         wd = Path(self.directory)
-        logger.info(f"Preparing the band structure, {wd}")
-
-        seamm_options = self.parent.global_options
+        logger.info("Preparing the band structure, %s", wd)
 
         spin_polarized = len(Efermi) == 2
 
-        # Read configuration file for DFTB+
-        ini_dir = Path(seamm_options["root"]).expanduser()
-        full_config = configparser.ConfigParser()
-        full_config.read(ini_dir / "dftbplus.ini")
-
-        executor = self.parent.flowchart.executor
-
         if spin_polarized:
-            cmd = ["dp_bands", "-s", input_path, "band"]
+            cmd = ["dp_bands", "-s", str(input_path), "band"]
+            outputs = ["band_s1.dat", "band_s2.dat"]
         else:
-            cmd = ["dp_bands", input_path, "band"]
-
-        result = executor.run(
-            cmd=cmd,
-            config=self.exe_config,
-            directory=self.directory,
-            files={},
-            return_files=["*"],
-            in_situ=True,
-            shell=True,
-        )
+            cmd = ["dp_bands", str(input_path), "band"]
+            outputs = ["band_tot.dat"]
 
-        if result is None:
+        if not self.run_dp_tools([(cmd, outputs)]):
             logger.error("There was an error running the DOS code")
             return None
 
         if spin_polarized:
-            # Read the spin-up data
-            with open(wd / "band_s1.dat", "r") as fd:
-                BandStructure = pandas.read_csv(
-                    fd,
-                    sep=r"\s+",
-                    header=None,
-                    index_col=0,
-                    comment="!",
-                )
-
-            mapper = {}
-            i = 0
-            for column in BandStructure.columns:
-                i += 1
-                mapper[column] = f"↑ {i}"
-                BandStructure[column] -= Efermi[0]
-            BandStructure.rename(columns=mapper, inplace=True)
-
-            # Read the spin-up data
-            with open(wd / "band_s2.dat", "r") as fd:
-                data = pandas.read_csv(
-                    fd,
-                    sep=r"\s+",
-                    header=None,
-                    index_col=0,
-                    comment="!",
-                )
-
-            i = 0
-            for column in data.columns:
-                i += 1
-                label = f"↓ {i}"
-                BandStructure[label] = data[column] - Efermi[1]
+            # Read the spin-up and spin-down data
+            up = read_table(wd / "band_s1.dat", index_dtype=int) - Efermi[0]
+            up.columns = [f"↑ {i}" for i in range(1, up.shape[1] + 1)]
+            down = read_table(wd / "band_s2.dat", index_dtype=int) - Efermi[1]
+            down.columns = [f"↓ {i}" for i in range(1, down.shape[1] + 1)]
+            BandStructure = pandas.concat([up, down], axis=1)
         else:
             # Read the plot data
-            with open(wd / "band_tot.dat", "r") as fd:
-                BandStructure = pandas.read_csv(
-                    fd,
-                    sep=r"\s+",
-                    header=None,
-                    index_col=0,
-                    comment="!",
-                )
-
-            mapper = {}
-            i = 0
-            for column in BandStructure.columns:
-                i += 1
-                mapper[column] = f"{i}"
-                BandStructure[column] -= Efermi[0]
-            BandStructure.rename(columns=mapper, inplace=True)
-
-        # Insert a column of labels
-        nrows = BandStructure.index.size
-        labels = [""] * nrows
-        for pt, label in zip(sym_points, sym_names):
-            labels[pt - 1] = label
-        BandStructure.insert(0, "labels", labels)
-
-        # And labels for each point in the path
-        BandStructure.insert(1, "points", self.path)
+            BandStructure = read_table(wd / "band_tot.dat", index_dtype=int)
+            BandStructure -= Efermi[0]
+            n_bands = BandStructure.shape[1]
+            BandStructure.columns = [str(i) for i in range(1, n_bands + 1)]
+
+        # Prepend columns of labels and the position of each point along the path
+        labels = np.full(BandStructure.index.size, "", dtype=object)
+        labels[np.asarray(sym_points) - 1] = sym_names
+        path = pandas.DataFrame(
+            {"labels": labels, "points": self.path}, index=BandStructure.index
+        )
+        BandStructure = pandas.concat([path, BandStructure], axis=1)
 
-        BandStructure.to_csv(Path(self.directory) / "BandStructure.csv")
+        self.write_table(BandStructure, wd / "BandStructure", "k-point")
 
         return BandStructure
 
@@ -269,37 +256,33 @@ class DftbBase(seamm.Node):
 
         logger.info("Preparing DOS")
 
-        # Total DOS
-        executor = self.parent.flowchart.executor
+        wd = Path(self.directory)
 
-        result = executor.run(
-            cmd=[
-                "dp_dos",
-                str(input_path),
-                "dos_total.dat",
-            ],
-            config=self.exe_config,
-            directory=self.directory,
-            files={},
-            return_files=["*"],
-            in_situ=True,
-            shell=True,
-        )
+        # Partial DOS convention is "pdos_{element}.{shell no}.out"
+        # Figure out the elements and files for each.
+        files = {}
+        for name in sorted(entry.name for entry in os.scandir(wd)):
+            match = pdos_filename.fullmatch(name)
+            if match is not None:
+                element = match.group(1)
+                if element not in files:
+                    files[element] = [wd / name]
+                else:
+                    files[element].append(wd / name)
 
-        if result is None:
+        # Run dp_dos for the total DOS and each partial DOS.
+        commands = [(["dp_dos", str(input_path), "dos_total.dat"], ["dos_total.dat"])]
+        for paths in files.values():
+            for path in paths:
+                out = path.with_suffix(".dat")
+                commands.append((["dp_dos", "-w", str(path), str(out)], [out.name]))
+
+        if not self.run_dp_tools(commands):
             logger.error("There was an error running the DOS code")
             return None
 
         # Read the total DOS data
-        wd = Path(self.directory)
-        with open(wd / "dos_total.dat", "r") as fd:
-            DOS = pandas.read_csv(
-                fd,
-                sep=r"\s+",
-                header=None,
-                comment="!",
-                index_col=0,
-            )
+        DOS = read_table(wd / "dos_total.dat")
 
         n_columns = DOS.shape[1]
         if n_columns == 1:
@@ -320,133 +303,75 @@ class DftbBase(seamm.Node):
         else:
             raise RuntimeError(f"The total DOS has {n_columns} columns of data.")
 
-        # Partial DOS convention is "pdos_{element}.{shell no}.out"
-        # Figure out the elements and files for each.
-        files = {}
-        for path in sorted(wd.glob("pdos*.out")):
-            element = path.stem.split("_")[1].split(".")[0]
-            if element not in files:
-                files[element] = [path]
-            else:
-                files[element].append(path)
-
-        # Process each element, accumulating the total
-        for element, paths in files.items():
-            if spin_polarized:
-                total_up = None
-                total_down = None
-            else:
-                total = None
+        # Read the partial DOS for each element and shell
+        pdos = {}
+        for paths in files.values():
             for path in paths:
-                out = path.with_suffix(".dat")
-                shell_no = int(path.suffixes[0][1:])
-                shell = ("s", "p", "d", "f")[shell_no - 1]
-                label = element + "_" + shell
-
-                result = executor.run(
-                    cmd=[
-                        "dp_dos",
-                        "-w",
-                        str(path),
-                        str(out),
-                    ],
-                    config=self.exe_config,
-                    directory=self.directory,
-                    files={},
-                    return_files=["*"],
-                    in_situ=True,
-                    shell=True,
-                )
-
-                if result is None:
-                    logger.error("There was an error running the DOS code")
-                    return None
-
-                # Read the plot data
-                with open(out, "r") as fd:
-                    data = pandas.read_csv(
-                        fd,
-                        sep=r"\s+",
-                        header=None,
-                        comment="!",
-                        index_col=0,
-                    )
-
+                data = read_table(path.with_suffix(".dat"))
                 n_columns = data.shape[1]
                 if n_columns == 1:
                     if spin_polarized:
                         raise RuntimeError(
                             f"Calculation is spin-polarized but {path} is not."
                         )
-                    data.rename(columns={0: "E", 1: label}, inplace=True)
-
-                    # Check the bounds. Sometimes rounding causes different grid sizes.
-                    tmp = data.index.isin(DOS.index)
-                    if not tmp.all():
-                        data = data.loc[tmp]
-                    tmp = DOS.index.isin(data.index)
-                    if not tmp.all():
-                        DOS = DOS.loc[tmp]
-                        if total is not None:
-                            total = total.loc[tmp]
-
-                    if total is None:
-                        total = data[label]
-                    else:
-                        total += data[label]
-
-                    if not DOS.index.equals(data.index):
-                        raise RuntimeError(
-                            f"The energy values for partial DOS {label} are  different!"
-                            f" ({out})"
-                        )
-
-                    DOS[label] = data[label].array
                 elif n_columns == 3:
                     if not spin_polarized:
                         raise RuntimeError(
                             f"Calculation is not spin-polarized but {path} is."
                         )
-                    data.rename(
-                        columns={0: "E", 1: "Total", 2: "Up", 3: "Down"}, inplace=True
-                    )
-                    # Check the bounds.
-                    tmp = data.index.isin(DOS.index)
-                    if not tmp.all():
-                        data = data.loc[tmp]
-                    tmp = DOS.index.isin(data.index)
-                    if not tmp.all():
-                        DOS = DOS.loc[tmp]
-                        if total_up is not None:
-                            total_up = total_up.loc[tmp]
-                            total_down = total_down.loc[tmp]
-                    if total_up is None:
-                        total_up = data["Up"]
-                        total_down = data["Down"]
-                    else:
-                        total_up += data["Up"]
-                        total_down += data["Down"]
-
-                    if not DOS.index.equals(data.index):
-                        raise RuntimeError(
-                            f"The energy values for partial DOS {label} are  different!"
-                            f" ({out})"
-                        )
-                    DOS[label + " ↑"] = data["Up"].array
-                    DOS[label + " ↓"] = data["Down"].array
                 else:
                     raise RuntimeError(f"The {path} has {n_columns} columns of data.")
+                pdos[path] = data
+
+        # Sometimes rounding causes different grid sizes, so keep only the energies
+        # common to all the files.
+        energies = functools.reduce(
+            np.intersect1d,
+            [data.index.to_numpy() for data in pdos.values()],
+            DOS.index.to_numpy(),
+        )
+        DOS = DOS[DOS.index.isin(energies)]
+
+        # Process each element, accumulating the total
+        columns = {}
+        for element, paths in files.items():
+            total = total_up = total_down = 0.0
+            for path in paths:
+                shell_no = int(path.suffixes[0][1:])
+                shell = ("s", "p", "d", "f")[shell_no - 1]
+                label = element + "_" + shell
+
+                data = pdos[path]
+                data = data[data.index.isin(energies)]
+                if len(data) != len(DOS):
+                    raise RuntimeError(
+                        f"The energy values for partial DOS {label} are  different!"
+                        f" ({path.with_suffix('.dat')})"
+                    )
+
+                if spin_polarized:
+                    up = data[2].to_numpy()
+                    down = data[3].to_numpy()
+                    columns[label + " ↑"] = up
+                    columns[label + " ↓"] = down
+                    total_up = total_up + up
+                    total_down = total_down + down
+                else:
+                    columns[label] = data[1].to_numpy()
+                    total = total + columns[label]
 
             if spin_polarized:
-                DOS[element + " ↑"] = total_up.array
-                DOS[element + " ↓"] = total_down.array
+                columns[element + " ↑"] = total_up
+                columns[element + " ↓"] = total_down
             else:
-                DOS[element] = total.array
+                columns[element] = total
+
+        DOS = pandas.concat([DOS, pandas.DataFrame(columns, index=DOS.index)], axis=1)
 
         # Shift the Fermi level to 0
         DOS.index -= Efermi[0]
 
-        DOS.to_csv(Path(self.directory) / "DOS.csv")
+        self.write_table(DOS, wd / "DOS", "E")
 
         return DOS
 
@@ -460,18 +385,101 @@ class DftbBase(seamm.Node):
         Efermi : float
             The Fermi energy in eV
         """
-        DOS = self.create_dos_data(input_path, Efermi=Efermi)
+        wd = Path(self.directory)
+        write_html = self.parent.options.get("html", False)
+
+        DOS = self.dos_data = self.create_dos_data(input_path, Efermi=Efermi)
 
         figure = cms_plots.dos(DOS, template="line.graph_template")
 
         # Write it out.
-        figure.dump(Path(self.directory) / "DOS.graph")
+        figure.dump(wd / "DOS.graph")
 
-        options = self.parent.options
-        write_html = "html" in options and options["html"]
         if write_html:
             figure.template = "line.html_template"
-            figure.dump(Path(self.directory) / "DOS.html")
+            figure.dump(wd / "DOS.html")
+
+    def run_dp_tools(self, commands):
+        """Run DFTB+ tools such as dp_dos, skipping runs that are up-to-date.
+
+        The tools are deterministic, so a command need not be rerun if its outputs
+        exist and its input file is unchanged since it was last run. The hashes of
+        the inputs are kept in 'dp_tools.json' in the working directory. The
+        commands are run one at a time because they share the working directory.
+
+        Parameters
+        ----------
+        commands : [([str], [str])]
+            The commands, as lists of arguments with the input file second to last,
+            and the names of the output files of each.
+
+        Returns
+        -------
+        bool
+            True if all the commands ran successfully.
+        """
+        wd = Path(self.directory)
+        cache_path = wd / "dp_tools.json"
+        if cache_path.exists():
+            cache = json.loads(cache_path.read_text())
+        else:
+            cache = {}
+
+        todo = {}
+        for cmd, outputs in commands:
+            key = " ".join(cmd)
+            input_path = wd / cmd[-2]
+            digest = hashlib.blake2b(input_path.read_bytes(), digest_size=16)
+            digest = digest.hexdigest()
+            if cache.get(key) != digest or not all(
+                (wd / output).exists() for output in outputs
+            ):
+                todo[key] = (cmd, digest)
+
+        if len(todo) == 0:
+            return True
+
+        executor = self.parent.flowchart.executor
+        for key, (cmd, digest) in todo.items():
+            result = executor.run(
+                cmd=cmd,
+                config=self.exe_config,
+                directory=self.directory,
+                files={},
+                return_files=["*"],
+                in_situ=True,
+                shell=True,
+            )
+            if result is None:
+                cache.pop(key, None)
+            else:
+                cache[key] = digest
+
+        cache_path.write_text(json.dumps(cache, indent=4))
+
+        return all(key in cache for key in todo)
+
+    def write_table(self, table, path, index_name):
+        """Write a table of data, such as the DOS, in the requested format.
+
+        Parameters
+        ----------
+        table : pandas.DataFrame
+            The data to write.
+        path : pathlib.Path
+            The path for the file, without the suffix.
+        index_name : str
+            The name of the index in parquet files, which need a string name.
+        """
+        if self.parent._data_format == "parquet":
+            # The labels of the k-points are mostly empty, so compress well as a
+            # category
+            if "labels" in table.columns:
+                table = table.astype({"labels": "category"})
+            table = table.rename_axis(index_name)
+            table.to_parquet(path.with_suffix(".parquet"), compression="snappy")
+        else:
+            table.to_csv(path.with_suffix(".csv"))
 
     def geometry(self):
         """Create the input for DFTB+ for the geometry.
@@ -494,32 +502,24 @@ class DftbBase(seamm.Node):
         """
         _, configuration = self.get_system_configuration(None)
 
-        result = "Geometry = {\n"
+        atom_symbols = configuration.atoms.symbols
+        elements = sorted(set(atom_symbols))
+        type_index = {element: i for i, element in enumerate(elements, start=1)}
 
-        elements = set(configuration.atoms.symbols)
-        elements = sorted([*elements])
+        lines = ["Geometry = {"]
         names = '{"' + '" "'.join(elements) + '"}'
-        result += f"   TypeNames = {names}\n"
+        lines.append(f"   TypeNames = {names}")
 
         if configuration.periodicity == 0:
-            result += "    TypesAndCoordinates [Angstrom] = {\n"
-            for element, xyz in zip(
-                configuration.atoms.symbols,
-                configuration.atoms.get_coordinates(fractionals=False),
-            ):
-                index = elements.index(element)
-                x, y, z = xyz
-                result += f"        {index+1:>2} {x:10.6f} {y:10.6f} {z:10.6f}\n"
-            result += "    }\n"
+            symbols = atom_symbols
+            xyzs = configuration.atoms.get_coordinates(fractionals=False)
+            lines.append("    TypesAndCoordinates [Angstrom] = {")
+            types = [type_index[element] for element in symbols]
+            lines.append(format_atoms(types, xyzs, "%10.6f"))
+            lines.append("    }")
 
             # The reference energy, if available
-            if self.parent._reference_energies is None:
-                self.parent._reference_energy = None
-            else:
-                energy = 0.0
-                for el in configuration.atoms.symbols:
-                    energy += self.parent._reference_energies[el]
-                self.parent._reference_energy = energy
+            self.set_reference_energy(symbols)
         elif configuration.periodicity == 3:
             if "primitive cell" in self.parameters:
                 use_primitive_cell = self.parameters["primitive cell"].get(
@@ -548,32 +548,40 @@ class DftbBase(seamm.Node):
                 self.mapping_to_primitive = [i for i in range(n_atoms)]
             symbols = to_symbols(atomic_numbers)
 
-            result += "   Periodic = Yes\n"
-            result += "   LatticeVectors [Angstrom] = {\n"
-
-            for xyz in lattice:
-                x, y, z = xyz
-                result += f"        {x:15.9f} {y:15.9f} {z:15.9f}\n"
-            result += "    }\n"
-            result += "    TypesAndCoordinates [relative] = {\n"
-            for element, xyz in zip(symbols, fractionals):
-                index = elements.index(element)
-                x, y, z = xyz
-                result += f"        {index+1:>2} {x:15.9f} {y:15.9f} {z:15.9f}\n"
-            result += "    }\n"
+            lines.append("   Periodic = Yes")
+            lines.append("   LatticeVectors [Angstrom] = {")
+            lines.extend(
+                f"        {x:15.9f} {y:15.9f} {z:15.9f}" for x, y, z in lattice
+            )
+            lines.append("    }")
+            lines.append("    TypesAndCoordinates [relative] = {")
+            types = [type_index[element] for element in symbols]
+            lines.append(format_atoms(types, fractionals, "%15.9f"))
+            lines.append("    }")
 
             # The reference energy, if available
-            if self.parent._reference_energies is None:
-                self.parent._reference_energy = None
-            else:
-                energy = 0.0
-                for el in symbols:
-                    energy += self.parent._reference_energies[el]
-                self.parent._reference_energy = energy
+            self.set_reference_energy(symbols)
+
+        lines.append("}")
 
-        result += "}\n"
+        return "\n".join(lines) + "\n"
 
-        return result
+    def set_reference_energy(self, symbols):
+        """Set the reference energy of the structure from those of the elements.
+
+        Parameters
+        ----------
+        symbols : [str]
+            The element symbols of the atoms.
+        """
+        energies = self.parent._reference_energies
+        if energies is None:
+            self.parent._reference_energy = None
+        else:
+            self.parent._reference_energy = sum(
+                energies[el] * count
+                for el, count in collections.Counter(symbols).items()
+            )
 
     def find_previous_step(self, cls, missing_ok=False):
         """Find the previous step of class 'cls'
@@ -590,12 +598,7 @@ class DftbBase(seamm.Node):
         seamm.Node
             The node if found, None if not.
         """
-        result = None
-        for step in self.parent._steps[::-1]:
-            if isinstance(step, cls):
-                result = step
-                break
-        return result
+        return self.parent._last_step.get(cls)
 
     def get_previous_charges(self, missing_ok=False):
         """Copy charges from the previous energy step."""
@@ -609,7 +612,9 @@ class DftbBase(seamm.Node):
         if from_path.exists():
             to_path = directory / "charges.dat"
             if not to_path.exists() or not to_path.samefile(from_path):
-                shutil.copy2(from_path, to_path)
+                # Not a link: DFTB+ rewrites charges.dat, which would clobber the
+                # previous step's file. copyfile uses the kernel's zero-copy path.
+                shutil.copyfile(from_path, to_path)
         else:
             if missing_ok:
                 return None
@@ -622,60 +627,53 @@ class DftbBase(seamm.Node):
         properties = dftbplus_step.metadata["results"]
 
         property_data = {}
-        line_iter = enumerate(lines.splitlines(), start=1)
-
-        try:
-            while True:
-                lineno, line = next(line_iter)
-                if len(line) == 0 or line[0] == "#":
-                    continue
-                if ":" not in line:
+
+        # Find all the headers, and from them the blocks of data between them.
+        headers = list(tag_header.finditer(lines))
+        ends = [header.start() for header in headers[1:]]
+        ends.append(len(lines))
+        for header, end in zip(headers, ends):
+            key, _type, ndims, rest = header.groups()
+            key = key.strip()
+            data = lines[header.end() + 1 : end]
+            if int(ndims) == 0:
+                # scalar
+                line = data.partition("\n")[0].rstrip("\r")
+                if _type == "real":
+                    property_data[key] = float(line)
+                else:
+                    property_data[key] = line
+            else:
+                dims = list(map(int, rest.split(",")))
+                n_to_read = int(np.prod(dims))
+
+                if _type == "real":
+                    values = np.fromstring(data, sep=" ")
+                else:
+                    values = data.split()
+
+                if len(values) != n_to_read:
                     raise RuntimeError(
-                        f"Problem parsing the results.tag file: {lineno}: " f"{line}"
+                        f"Problem parsing the results.tag file: {key} should have "
+                        f"{n_to_read} values but has {len(values)}."
                     )
-                key, _type, ndims, rest = line.split(":", maxsplit=3)
-                ndims = int(ndims)
-                key = key.strip()
-                if ndims == 0:
-                    # scalar
-                    lineno, line = next(line_iter)
-                    if _type == "real":
-                        property_data[key] = float(line)
-                    else:
-                        property_data[key] = line
+
+                if key == "fermi_level":
+                    # The Fermi level has one or two values if spin-polarized, but
+                    # normally they are the same, so turn into a scalar.
+                    property_data[key] = float(values[0])
                 else:
-                    dims = [int(x) for x in rest.split(",")]
-                    n_to_read = 1
-                    for dim in dims:
-                        n_to_read *= dim
-                    values = []
-                    while len(values) < n_to_read:
-                        lineno, line = next(line_iter)
-                        values.extend(line.strip().split())
-
-                    if _type == "real":
-                        values = [float(x) for x in values]
-
-                    if key == "fermi_level":
-                        # The Fermi level has one or two values if spin-polarized, but
-                        # normally they are the same, so turn into a scalar.
-                        property_data[key] = values[0]
-                    else:
-                        property_data[key] = redimension(values, dims)
-                if key not in properties:
-                    self.logger.warning("Property '{}' not recognized.".format(key))
-                if key in properties and "units" in properties[key]:
-                    property_data[key + ",units"] = properties[key]["units"]
-        except StopIteration:
-            pass
+                    property_data[key] = redimension(values, dims)
+            if key not in properties:
+                self.logger.warning("Property '%s' not recognized.", key)
+            if key in properties and "units" in properties[key]:
+                property_data[key + ",units"] = properties[key]["units"]
 
         # Create the standard properties needed for energy, gradients, etc.
         property_data["energy"] = property_data["total_energy"]
         property_data["energy,units"] = "e_H"
         if "forces" in property_data:
-            property_data["gradients"] = [
-                [-v for v in row] for row in property_data["forces"]
-            ]
+            property_data["gradients"] = (-np.array(property_data["forces"])).tolist()
             property_data["gradients,units"] = "E_h/Å"
         property_data["model"] = self.model
 
@@ -709,12 +707,13 @@ class DftbBase(seamm.Node):
         # Get the geometry first, because this sets up the primitive cell if needed
         geom = self.geometry()
 
-        input_data = copy.deepcopy(current_input)
-        result = self.get_input()
-        deep_merge(input_data, result)
+        # Merging into an empty dict copies the nested dicts of the input, so there is
+        # no need to deepcopy it.
+        input_data = {}
+        deep_merge(input_data, current_input)
+        deep_merge(input_data, self.get_input())
 
-        hsd = dict_to_hsd(input_data)
-        hsd += geom
+        hsd = dict_to_hsd(input_data) + geom
 
         # The header part of the output
         for value in self.description:
@@ -723,19 +722,11 @@ class DftbBase(seamm.Node):
         # Check for successful run, don't rerun
         success = directory / "success.dat"
         if not success.exists():
-            files = {"dftb_in.hsd": hsd}
-            logger.info("dftb_in.hsd:\n" + files["dftb_in.hsd"])
-
-            # If the charge file exists, use it!
-            path = directory / "charges.dat"
-            if path.exists():
-                files["charges.dat"] = path.read_text()
+            logger.info("dftb_in.hsd:\n%s", hsd)
 
-            # Write the input files to the current directory
-            for filename in files:
-                path = directory / filename
-                with path.open(mode="w") as fd:
-                    fd.write(files[filename])
+            # Write the input file to the working directory, where DFTB+ runs in situ.
+            # The charges from a previous step, if any, are already there.
+            (directory / "dftb_in.hsd").write_text(hsd)
 
             if not P["input only"]:
                 # Get the computational environment and set limits
@@ -783,7 +774,7 @@ class DftbBase(seamm.Node):
                     cmd=["{code}", ">", "DFTB+.out", "2>", "stderr.txt"],
                     config=self.exe_config,
                     directory=self.directory,
-                    files=files,
+                    files={},
                     return_files=return_files,
                     in_situ=True,
                     shell=True,
@@ -794,7 +785,8 @@ class DftbBase(seamm.Node):
                     logger.error("There was an error running DFTB+")
                     return None
 
-                logger.debug("\n" + pprint.pformat(result))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("\n%s", pprint.pformat(result))
 
         if not P["input only"]:
             # Parse the results.tag file
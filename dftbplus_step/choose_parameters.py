@@ -25,7 +25,7 @@ class ChooseParameters(DftbBase):
     ):
         """Initialize the node"""
 
-        logger.debug("Creating ChooseParameters {}".format(self))
+        logger.debug("Creating ChooseParameters %s", self)
 
         super().__init__(flowchart=flowchart, title=title, extension=extension)
 
@@ -108,8 +108,7 @@ class ChooseParameters(DftbBase):
         system_db = self.get_variable("_system_db")
         configuration = system_db.system.configuration
         parameters = {}
-        elements = set(configuration.atoms.symbols)
-        elements = sorted([*elements])
+        elements = sorted(set(configuration.atoms.symbols))
 
         if model == "DFTB":
             potentials = metadata[model]["potentials"]
@@ -159,20 +158,36 @@ class ChooseParameters(DftbBase):
             else:
                 subdata = None
 
+            # Gather the maximum angular momentum, Hubbard derivatives and reference
+            # energies in one pass, preferring the subset's value for each key.
             references = set()
             max_momentum = {}
-            key = "maximum angular momentum"
+            derivative = {}
+            energies = {}
             for el in elements:
-                if subdata is not None and el in subdata and key in subdata[el]:
-                    max_momentum[el] = subdata[el][key]
-                    if "citations" in subdata[el]:
-                        for reference in subdata[el]["citations"]:
-                            references.add(reference)
-                else:
-                    max_momentum[el] = data[el][key]
-                    if "citations" in data[el]:
-                        for reference in data[el]["citations"]:
-                            references.add(reference)
+                sub = subdata[el] if subdata is not None and el in subdata else {}
+                base = data.get(el, {})
+
+                key = "maximum angular momentum"
+                eldata = sub if key in sub else data[el]
+                max_momentum[el] = eldata[key]
+                references.update(eldata.get("citations", ()))
+
+                key = "Hubbard derivative"
+                if key in sub:
+                    derivative[el] = sub[key]
+                elif key in base:
+                    derivative[el] = base[key]
+
+                # The reference energies are only usable if all elements have one
+                key = "reference energy"
+                if energies is not None:
+                    if key in sub:
+                        energies[el] = float(sub[key])
+                    elif key in base:
+                        energies[el] = float(base[key])
+                    else:
+                        energies = None
 
             result = {
                 "Hamiltonian": {
@@ -182,30 +197,10 @@ class ChooseParameters(DftbBase):
                     }
                 }
             }
-
-            # Check if we have Hubbard derivatives
-            key = "Hubbard derivative"
-            derivative = {}
-            for el in elements:
-                if subdata is not None and el in subdata and key in subdata[el]:
-                    derivative[el] = subdata[el][key]
-                elif el in data and key in data[el]:
-                    derivative[el] = data[el][key]
             if len(derivative) > 0:
                 result["Hamiltonian"]["DFTB"]["HubbardDerivs"] = derivative
 
-            # Check if we have reference energies
-            key = "reference energy"
-            tmp = {}
-            for el in elements:
-                if subdata is not None and el in subdata and key in subdata[el]:
-                    tmp[el] = float(subdata[el][key])
-                elif el in data and key in data[el]:
-                    tmp[el] = float(data[el][key])
-                else:
-                    tmp = None
-                    break
-            self.parent._reference_energies = tmp
+            self.parent._reference_energies = energies
 
             # Add the references
             for reference in references:
@@ -244,7 +239,7 @@ class ChooseParameters(DftbBase):
 
         return result
 
-    def analyze(self, indent="", data={}, out=[]):
+    def analyze(self, indent="", data=None, out=None):
         """Parse the output and generating the text output and store the
         data in variables for other stages to access
         """
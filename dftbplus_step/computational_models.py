@@ -1,6 +1,6 @@
+import functools
+import importlib.resources
 import json
-from pathlib import Path
-import pkg_resources
 
 from seamm_util import element_data
 
@@ -8,12 +8,27 @@ from seamm_util import element_data
 atno = {symbol: d["atomic number"] for symbol, d in element_data.items()}
 
 
+@functools.lru_cache(maxsize=1)
+def slako_metadata():
+    """Read the metadata for the Slater-Koster parameters.
+
+    The metadata is a package resource, so it is read once and shared by all the
+    DFTB+ steps and their GUIs. It should not be modified.
+    """
+    path = importlib.resources.files("dftbplus_step") / "data" / "metadata.json"
+    if not path.is_file():
+        raise RuntimeError("Can't find Slater-Koster metadata.json file")
+    return json.loads(path.read_text())
+
+
+@functools.lru_cache(maxsize=1)
 def computational_models_metadata():
-    """Create the metadata for the computational models from the paramater metadata."""
-    data_path = Path(pkg_resources.resource_filename(__name__, "data"))
-    path = data_path / "metadata.json"
-    with open(path) as fd:
-        package_data = json.load(fd)
+    """Create the metadata for the computational models from the paramater metadata.
+
+    The metadata is a package resource that does not change, so it is read only
+    once. The same dictionary is returned on each call and should not be modified.
+    """
+    package_data = slako_metadata()
 
     models = {}
     for base_model, base_model_data in package_data.items():
@@ -22,10 +37,8 @@ def computational_models_metadata():
         for tmp, data in base_model_data["datasets"].items():
             dataset = tmp.split(" - ")[1]
             if "element sets" in data:
-                symbols = set()
-                for element_set in data["element sets"]:
-                    symbols |= set(element_set)
-                elements = [f"{z}" for z in sorted([atno[s] for s in symbols])]
+                symbols = set().union(*data["element sets"])
+                elements = ",".join(str(z) for z in sorted(atno[s] for s in symbols))
                 if "parent" not in data or data["parent"] is None:
                     if dataset not in model_data:
                         model_data[dataset] = {"parameterizations": {}}
@@ -40,7 +53,7 @@ def computational_models_metadata():
                 pdata["periodic"] = True
                 pdata["reactions"] = True
                 pdata["optimization"] = True
-                pdata["elements"] = ",".join(elements)
+                pdata["elements"] = elements
             elif "elements" in data:
                 elements = data["elements"]
                 if dataset not in model_data:
@@ -6,7 +6,8 @@
 import collections.abc
 import configparser
 import importlib
-import json
+import importlib.util
+import itertools
 import logging
 import os
 from pathlib import Path
@@ -14,8 +15,11 @@ import pprint  # noqa: F401
 import shutil
 import sys
 
+import numpy as np
+
 import molsystem
 import dftbplus_step
+from .computational_models import slako_metadata
 import seamm
 import seamm_util
 import seamm_util.printing as printing
@@ -58,7 +62,7 @@ def deep_merge(d, u):
     """  # noqa: E501
     stack = [(d, u)]
     while stack:
-        d, u = stack.pop(0)
+        d, u = stack.pop()
         for k, v in u.items():
             if not isinstance(v, collections.abc.Mapping):
                 # u[k] is not a dict, nothing to merge, so just set it,
@@ -94,18 +98,28 @@ def dict_to_hsd(d, indent=0):
     hsd : str
         The HSD text.
     """
-    hsd = ""
-    for key, value in d.items():
-        if isinstance(value, collections.abc.Mapping):
-            if "<" in key:
-                key = key.split("<")[0]
-            hsd += indent * " " + key + " {\n"
-            hsd += dict_to_hsd(value, indent + 4)
-            hsd += indent * " " + "}\n"
+    # Each entry is the indentation, the remaining items, and the line closing the
+    # section when they are done, which is None for the top level.
+    lines = []
+    stack = [(indent * " ", iter(d.items()), None)]
+    while stack:
+        pad, items, closing = stack[-1]
+        for key, value in items:
+            if isinstance(value, collections.abc.Mapping):
+                if "<" in key:
+                    key = key.split("<")[0]
+                lines.append(f"{pad}{key} {{\n")
+                # Finish the subsection before carrying on with this one
+                stack.append((pad + 4 * " ", iter(value.items()), f"{pad}}}\n"))
+                break
+            else:
+                lines.append(f"{pad}{key} = {value}\n")
         else:
-            hsd += indent * " " + f"{key} = {value}\n"
+            stack.pop()
+            if closing is not None:
+                lines.append(closing)
 
-    return hsd
+    return "".join(lines)
 
 
 def parse_gen_file(data):
@@ -142,13 +156,13 @@ def parse_gen_file(data):
 
         elements = next(line).split()
 
-        # And now the atoms
-        coordinates = result["coordinates"] = []
-        result["elements"] = []
-        for i in range(n_atoms):
-            _, index, x, y, z = next(line).split()
-            result["elements"].append(elements[int(index) - 1])
-            coordinates.append([float(x), float(y), float(z)])
+        # And now the atoms, parsed in one pass
+        atoms = list(itertools.islice(line, n_atoms))
+        if len(atoms) < n_atoms:
+            raise EOFError("The gen file ended prematurely.")
+        table = np.loadtxt(atoms, usecols=(1, 2, 3, 4), ndmin=2)
+        result["elements"] = [elements[i - 1] for i in table[:, 0].astype(int)]
+        result["coordinates"] = table[:, 1:].tolist()
 
         # Cell information if periodic
         if result["periodicity"] == 3:
@@ -220,7 +234,7 @@ class Dftbplus(seamm.Node):
         -------
         None
         """
-        logger.debug("Creating DFTB+ {}".format(self))
+        logger.debug("Creating DFTB+ %s", self)
         self.subflowchart = seamm.Flowchart(
             parent=self, name="DFTB+", namespace=namespace
         )
@@ -236,12 +250,7 @@ class Dftbplus(seamm.Node):
         self.parameters = dftbplus_step.DftbplusParameters()
 
         # Get the metadata for the Slater-Koster parameters
-        resources = importlib.resources.files("dftbplus_step") / "data"
-        path = resources / "metadata.json"
-        if not path.exists():
-            raise RuntimeError("Can't find Slater-Koster metadata.json file")
-        data = path.read_text()
-        self._metadata = json.loads(data)
+        self._metadata = slako_metadata()
 
         # Data to pass between substeps
         self._exe_config = None
@@ -250,6 +259,8 @@ class Dftbplus(seamm.Node):
         self._reference_energies = None  # Reference energies per element.
         self._reference_energy = None  # for calculating energy of formation
         self._steps = None  # The nodes for the steps run so far.
+        self._last_step = None  # The last node run of each class, including bases.
+        self._data_format = "csv"  # The format for the band structure and DOS data
 
     @property
     def version(self):
@@ -333,6 +344,14 @@ class Dftbplus(seamm.Node):
             help="whether to write out html files for graphs, etc.",
         )
 
+        parser.add_argument(
+            parser_name,
+            "--data-format",
+            default="csv",
+            choices=["csv", "parquet"],
+            help="the file format for the band structure and DOS data",
+        )
+
         return result
 
     def set_id(self, node_id):
@@ -375,9 +394,7 @@ class Dftbplus(seamm.Node):
                     )
                 )
                 logger.critical(
-                    "Error describing dftbplus flowchart: {} in {}".format(
-                        str(e), str(node)
-                    )
+                    "Error describing dftbplus flowchart: %s in %s", e, node
                 )
                 raise
             except:  # noqa: E722
@@ -387,9 +404,9 @@ class Dftbplus(seamm.Node):
                     )
                 )
                 logger.critical(
-                    "Unexpected error describing dftbplus flowchart: {} in {}".format(
-                        sys.exc_info()[0], str(node)
-                    )
+                    "Unexpected error describing dftbplus flowchart: %s in %s",
+                    sys.exc_info()[0],
+                    node,
                 )
                 raise
             text += "\n"
@@ -421,6 +438,9 @@ class Dftbplus(seamm.Node):
         printer.important(self.header)
         printer.important("")
 
+        # Check the data format now rather than after the calculations
+        self._data_format = self.get_data_format()
+
         # Add the main citation for DFTB+
         self.references.cite(
             raw=self._bibliography["dftbplus"],
@@ -441,8 +461,11 @@ class Dftbplus(seamm.Node):
             }
         }
         self._steps = steps = [start]
+        self._last_step = last_step = {}
         while node is not None:
             steps.append(node)
+            for cls in type(node).__mro__:
+                last_step[cls] = node
             if node.is_runable:
                 node.run(input_data)
             else:
@@ -483,6 +506,27 @@ class Dftbplus(seamm.Node):
 
             node = node.next()
 
+    def get_data_format(self):
+        """The format for the band structure and DOS data, 'csv' or 'parquet'.
+
+        Parquet files need pyarrow or fastparquet, which are optional. If neither
+        is installed, fall back to CSV with a warning.
+        """
+        data_format = self.options.get("data_format", "csv")
+        if data_format == "parquet" and not any(
+            importlib.util.find_spec(engine) is not None
+            for engine in ("pyarrow", "fastparquet")
+        ):
+            text = (
+                "Writing parquet files requires pyarrow or fastparquet, neither of "
+                "which is installed. Writing CSV files instead."
+            )
+            logger.warning(text)
+            printer.important(__(text, indent=4 * " "))
+            printer.important("")
+            data_format = "csv"
+        return data_format
+
     def get_exe_config(self):
         """Read the `dftbplus.ini` file, creating if necessary."""
         executor = self.flowchart.executor
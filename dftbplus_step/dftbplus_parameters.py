@@ -95,7 +95,7 @@ class DftbplusParameters(seamm.Parameters):
         },
     }
 
-    def __init__(self, defaults={}, data=None):
+    def __init__(self, defaults=None, data=None):
         """
         Initialize the parameters, by default with the parameters defined above
 
@@ -112,6 +112,8 @@ class DftbplusParameters(seamm.Parameters):
         -------
         None
         """
+        if defaults is None:
+            defaults = {}
 
         logger.debug("DftbplusParameters.__init__")
 
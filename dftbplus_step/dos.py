@@ -4,10 +4,6 @@
 
 import logging
 from pathlib import Path
-import textwrap
-
-import numpy as np
-import seekpath
 
 import dftbplus_step
 import seamm
@@ -28,7 +24,7 @@ class DOS(DftbBase):
     def __init__(self, flowchart=None, title="DOS", extension=None, logger=logger):
         """Initialize the node"""
 
-        logger.debug("Creating DOS {}".format(self))
+        logger.debug("Creating DOS %s", self)
 
         super().__init__(flowchart=flowchart, title=title, extension=extension)
 
@@ -38,8 +34,6 @@ class DOS(DftbBase):
         self.parameters = dftbplus_step.DOSParameters()
 
         self.description = ["DOS for DFTB+"]
-        self.points = None  # Points along graphs of symmetry lines
-        self.labels = None  # Labels of the symmetry lines
         self.energy_step = None  # The step that got the energy and density
 
     @property
@@ -191,10 +185,13 @@ class DOS(DftbBase):
         }
         return result
 
-    def analyze(self, indent="", data={}, out=[]):
+    def analyze(self, indent="", data=None, out=None):
         """Parse the output and generating the text output and store the
         data in variables for other stages to access
         """
+        if data is None:
+            data = {}
+
         # Print the key results
         text = "Prepared the DOS graph."
 
@@ -220,71 +217,3 @@ class DOS(DftbBase):
             results=self.parameters["results"].value,
             create_tables=self.parameters["create tables"].get(),
         )
-
-    def kpoints(self, nPoints):
-        """Create the lines of kpoints for DFTB+."""
-        system, configuration = self.get_system_configuration(None)
-        cell_data = configuration.primitive_cell()
-
-        # Get the lines
-        seekpath_output = seekpath.get_path(cell_data[0:3], with_time_reversal=True)
-
-        # Get the total length of the path.
-        total_length = 0.0
-        for start_label, stop_label in seekpath_output["path"]:
-            start_coord = np.array(seekpath_output["point_coords"][start_label])
-            stop_coord = np.array(seekpath_output["point_coords"][stop_label])
-            start_coord_abs = np.dot(
-                start_coord, seekpath_output["reciprocal_primitive_lattice"]
-            )
-            stop_coord_abs = np.dot(
-                stop_coord, seekpath_output["reciprocal_primitive_lattice"]
-            )
-            segment_length = np.linalg.norm(stop_coord_abs - start_coord_abs)
-            total_length += segment_length
-
-        # And extra points needed -- 1 at start, and one at each break
-        last_label = ""
-        extra_points = 0
-        for start_label, stop_label in seekpath_output["path"]:
-            if start_label != last_label:
-                extra_points += 1
-            last_label = stop_label
-
-        n = nPoints - extra_points
-        result = []
-        last_label = ""
-        total = 0
-        self.points = points = []
-        self.labels = labels = []
-        for start_label, stop_label in seekpath_output["path"]:
-            start_coord = np.array(seekpath_output["point_coords"][start_label])
-            stop_coord = np.array(seekpath_output["point_coords"][stop_label])
-
-            start_coord_abs = np.dot(
-                start_coord, seekpath_output["reciprocal_primitive_lattice"]
-            )
-            stop_coord_abs = np.dot(
-                stop_coord, seekpath_output["reciprocal_primitive_lattice"]
-            )
-            segment_length = np.linalg.norm(stop_coord_abs - start_coord_abs)
-
-            # See if we needed an added point at the start
-            if start_label != last_label:
-                x, y, z = start_coord.tolist()
-                result.append(f"   1 {x:.4f} {y:.4f} {z:.4f}   # {start_label}")
-                total += 1
-                points.append(total)
-                labels.append(start_label)
-            last_label = stop_label
-
-            num_points = max(2, int(round(n * segment_length / total_length)))
-            x, y, z = stop_coord.tolist()
-            result.append(f"{num_points:4} {x:.4f} {y:.4f} {z:.4f}   # {stop_label}")
-            total += num_points
-            points.append(total)
-            labels.append(stop_label)
-
-        result.append("}")
-        result = textwrap.indent("\n".join(result), 8 * " ")
-        return "Klines {\n" + result
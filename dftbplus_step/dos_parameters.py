@@ -87,8 +87,10 @@ class DOSParameters(seamm.Parameters):
         },
     }
 
-    def __init__(self, defaults={}, data=None):
+    def __init__(self, defaults=None, data=None):
         """Initialize the instance, by default from the default
         parameters given in the class"""
+        if defaults is None:
+            defaults = {}
 
         super().__init__(defaults={**DOSParameters.parameters, **defaults}, data=data)
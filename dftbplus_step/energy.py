@@ -2,7 +2,6 @@
 
 """Setup DFTB+"""
 
-import configparser
 import csv
 import gzip
 
@@ -40,7 +39,7 @@ class Energy(DftbBase):
     ):
         """Initialize the node"""
 
-        logger.debug("Creating Energy {}".format(self))
+        logger.debug("Creating Energy %s", self)
 
         super().__init__(flowchart=flowchart, title=title, extension=extension)
 
@@ -565,10 +564,13 @@ class Energy(DftbBase):
                 result["Analysis"]["WriteEigenvectors"] = "Yes"
         return result
 
-    def analyze(self, indent="", data={}, out=[]):
+    def analyze(self, indent="", data=None, out=None):
         """Parse the output and generating the text output and store the
         data in variables for other stages to access
         """
+        if data is None:
+            data = {}
+
         options = self.parent.options
 
         # Get the configuration and basic information
@@ -646,8 +648,7 @@ class Energy(DftbBase):
             Efermi = [Q_(data["fermi_level"], "hartree").to("eV").magnitude]
         else:
             Efermi = [0.0]
-        wd = Path(self.directory)
-        self.dos(wd / "band.out", Efermi=Efermi)
+        self.dos(directory / "band.out", Efermi=Efermi)
 
         text_lines = []
         # Get charges and spins, etc.
@@ -982,25 +983,11 @@ class Energy(DftbBase):
         path = directory / "waveplot_in.hsd"
         hsd.dump(input_data, str(path))
 
-        # And run WAVEPLOT
-        seamm_options = self.parent.global_options
-        # Read configuration file for DFTB+
-        ini_dir = Path(seamm_options["root"]).expanduser()
-        full_config = configparser.ConfigParser()
-        full_config.read(ini_dir / "dftbplus.ini")
-
+        # And run WAVEPLOT, using the configuration already read by the DFTB+ step
         executor = self.parent.flowchart.executor
-        executor_type = executor.name
-        if executor_type not in full_config:
-            raise RuntimeError(
-                f"No section for '{executor_type}' in DFTB+ ini file "
-                f"({ini_dir / 'dftbplus.ini'})"
-            )
-        config = dict(full_config.items(executor_type))
-
         result = executor.run(
             cmd=["waveplot", ">", "waveplot.out"],
-            config=config,
+            config=self.exe_config,
             directory=self.directory,
             files={},
             return_files=["*"],
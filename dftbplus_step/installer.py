@@ -6,9 +6,9 @@ This handles any further installation needed after installing the Python
 package `dftbplus-step`.
 """
 
+import importlib.resources
 import logging
 from pathlib import Path
-import pkg_resources
 import requests
 import shutil
 import subprocess
@@ -64,12 +64,12 @@ class Installer(seamm_installer.InstallerBase):
 
         self.section = "dftbplus-step"
         self.executables = ["dftb+"]
-        self.resource_path = Path(pkg_resources.resource_filename(__name__, "data/"))
+        self.resource_path = Path(importlib.resources.files("dftbplus_step") / "data")
 
         self.slako_url = "https://dftb.org/fileadmin/DFTB/public/slako-unpacked.tar.xz"
 
         # The environment.yaml file for Conda installations.
-        logger.debug(f"data directory: {self.resource_path}")
+        logger.debug("data directory: %s", self.resource_path)
         self.environment_file = self.resource_path / "seamm-dftbplus.yml"
 
     def check(self):
@@ -21,7 +21,7 @@ class Optimization(dftbplus_step.Energy):
     def __init__(self, flowchart=None, title="Optimization", extension=None):
         """Initialize the node"""
 
-        logger.debug("Creating Optimization {}".format(self))
+        logger.debug("Creating Optimization %s", self)
 
         super().__init__(flowchart=flowchart, title=title, extension=extension)
 
@@ -131,10 +131,13 @@ class Optimization(dftbplus_step.Energy):
 
         return result
 
-    def analyze(self, indent="", data={}, out=[]):
+    def analyze(self, indent="", data=None, out=None):
         """Parse the output and generating the text output and store the
         data in variables for other stages to access
         """
+        if data is None:
+            data = {}
+
         text = ""
 
         # Get the parameters used
@@ -95,7 +95,7 @@ def analyze_directory(root="data/slako"):
             parent = parent.parent
         grandparent = parent.parent
         parameterization = grandparent.name
-        logger.debug(f"{path}: {parameterization}")
+        logger.debug("%s: %s", path, parameterization)
         version = ".".join(parent.name.split("-")[1:])
         if parameterization not in parameterizations:
             parameterizations.append(parameterization)
@@ -130,7 +130,7 @@ def analyze_directory(root="data/slako"):
             data["md5 mismatch"] = False
 
         if parameterization not in metadata:
-            logger.info(f"   adding {parameterization}")
+            logger.info("   adding %s", parameterization)
             pdata = metadata[parameterization] = {}
         else:
             pdata = metadata[parameterization]
@@ -515,8 +515,7 @@ def create_datafile(directory="~/SEAMM/Parameters/slako"):
     # Print and save the results
     data = json.dumps(result, indent=4, sort_keys=True)
     # print(data)
-    with open(directory / "metadata.json", "w") as fd:
-        fd.write(data)
+    (directory / "metadata.json").write_text(data)
 
 
 def add_wavefunction(directory="."):
@@ -2,14 +2,10 @@
 
 """The graphical part of a DFTB+ ChooseParameters node"""
 
-try:
-    import importlib.metadata as implib
-except Exception:
-    import importlib_metadata as implib
-import json
 import logging
 import tkinter as tk
 
+from .computational_models import slako_metadata
 import seamm
 from seamm_util import element_data
 import seamm_widgets as sw
@@ -75,12 +71,7 @@ class TkChooseParameters(seamm.TkNode):
         )
 
         # Get the metadata for the Slater-Koster parameters
-        package = self.__module__.split(".")[0]
-        files = [p for p in implib.files(package) if p.name == "metadata.json"]
-        if len(files) != 1:
-            raise RuntimeError("Can't find Slater-Koster metadata.json file")
-        data = files[0].read_text()
-        self._metadata = json.loads(data)
+        self._metadata = slako_metadata()
 
     def right_click(self, event):
         """Probably need to add our dialog..."""
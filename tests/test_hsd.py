@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the DFTB+ input and geometry file helpers."""
+
+import hsd
+import pytest
+
+from dftbplus_step.dftbplus import dict_to_hsd, parse_gen_file
+
+input_data = {
+    "Options": {"WriteResultsTag": "Yes"},
+    "Hamiltonian<DFTB": {
+        "SCC": "Yes",
+        "Filling": {"Fermi": {"Temperature [Kelvin]": 300.0}},
+        "Mixer": {},
+        "MaxSCCIterations": 100,
+    },
+    "ParserOptions": {"ParserVersion": 12},
+}
+
+
+def test_dict_to_hsd():
+    """Nested sections, an empty section and a 'key<...' name."""
+    assert dict_to_hsd(input_data) == (
+        "Options {\n"
+        "    WriteResultsTag = Yes\n"
+        "}\n"
+        "Hamiltonian {\n"
+        "    SCC = Yes\n"
+        "    Filling {\n"
+        "        Fermi {\n"
+        "            Temperature [Kelvin] = 300.0\n"
+        "        }\n"
+        "    }\n"
+        "    Mixer {\n"
+        "    }\n"
+        "    MaxSCCIterations = 100\n"
+        "}\n"
+        "ParserOptions {\n"
+        "    ParserVersion = 12\n"
+        "}\n"
+    )
+
+
+def test_dict_to_hsd_indent():
+    """The indent applies to every line, including the closing braces."""
+    assert dict_to_hsd({"a": 1, "b": {"c": 2}}, indent=2) == (
+        "  a = 1\n  b {\n      c = 2\n  }\n"
+    )
+
+
+def test_dict_to_hsd_round_trip():
+    """The HSD text reads back as the same structure."""
+    data = hsd.load_string(dict_to_hsd(input_data))
+    assert data["Options"] == {"WriteResultsTag": True}
+    assert data["Hamiltonian"]["Mixer"] == {}
+    assert data["Hamiltonian"]["Filling"]["Fermi"]["Temperature"] == 300.0
+    assert data["Hamiltonian"]["MaxSCCIterations"] == 100
+    assert data["ParserOptions"] == {"ParserVersion": 12}
+
+
+water_gen = """\
+    3  C
+  O H
+    1 1    0.00000000000E+00   0.00000000000E+00   0.11926200000E+00
+    2 2    0.00000000000E+00   0.76324000000E+00  -0.47704700000E+00
+    3 2    0.00000000000E+00  -0.76324000000E+00  -0.47704700000E+00
+"""
+
+gaas_gen = """\
+    2  F
+  Ga As
+    1 1    0.00000000000E+00   0.00000000000E+00   0.00000000000E+00
+    2 2    0.25000000000E+00   0.25000000000E+00   0.25000000000E+00
+    0.00000000000E+00   0.00000000000E+00   0.00000000000E+00
+    0.00000000000E+00   0.28265000000E+01   0.28265000000E+01
+    0.28265000000E+01   0.00000000000E+00   0.28265000000E+01
+    0.28265000000E+01   0.28265000000E+01   0.00000000000E+00
+"""
+
+
+def test_parse_gen_file_cartesian():
+    """A molecule in Cartesian coordinates."""
+    result = parse_gen_file(water_gen)
+    assert result["periodicity"] == 0
+    assert result["coordinate system"] == "Cartesian"
+    assert result["elements"] == ["O", "H", "H"]
+    assert result["coordinates"] == [
+        [0.0, 0.0, 0.119262],
+        [0.0, 0.76324, -0.477047],
+        [0.0, -0.76324, -0.477047],
+    ]
+    assert "lattice vectors" not in result
+
+
+def test_parse_gen_file_fractional():
+    """A crystal in fractional coordinates, with the origin and lattice."""
+    result = parse_gen_file(gaas_gen)
+    assert result["periodicity"] == 3
+    assert result["coordinate system"] == "fractional"
+    assert result["elements"] == ["Ga", "As"]
+    assert result["coordinates"] == [[0.0, 0.0, 0.0], [0.25, 0.25, 0.25]]
+    assert result["origin"] == [0.0, 0.0, 0.0]
+    assert result["lattice vectors"] == [
+        [0.0, 2.8265, 2.8265],
+        [2.8265, 0.0, 2.8265],
+        [2.8265, 2.8265, 0.0],
+    ]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        water_gen.rsplit("\n", 2)[0],  # missing the last atom
+        gaas_gen.rsplit("\n", 2)[0],  # missing the last lattice vector
+        water_gen.split("\n", 1)[0],  # only the header
+    ],
+)
+def test_parse_gen_file_truncated(text):
+    """A gen file that ends early raises EOFError."""
+    with pytest.raises(EOFError):
+        parse_gen_file(text)
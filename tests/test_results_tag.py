@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for parsing the results.tag file from DFTB+."""
+
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from dftbplus_step.base import DftbBase, redimension
+
+results_tag = """\
+mermin_energy       :real:0:
+  -0.812345678901234E+01
+total_energy        :real:0:
+  -0.812345678901235E+01
+n_iterations        :integer:0:
+         7
+fermi_level         :real:1:2
+  -0.150000000000000E+00 -0.150000000000000E+00
+forces              :real:2:3,2
+   0.100000000000000E-01  0.200000000000000E-01 -0.300000000000000E-01
+  -0.100000000000000E-01 -0.200000000000000E-01  0.300000000000000E-01
+eigenvalues         :real:3:2,1,2
+  -0.500000000000000E+00  0.250000000000000E+00 -0.400000000000000E+00
+   0.350000000000000E+00
+atom_types          :integer:1:3
+         1         2         2
+"""
+
+
+def parse(text):
+    """Parse the text with a stand-in for the step, which needs a logger and model."""
+    step = SimpleNamespace(logger=logging.getLogger(__name__), model="DFTB/3ob")
+    return DftbBase.parse_results(step, text)
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_parse_results(newline):
+    """Parse scalars and arrays of several shapes, with either line ending."""
+    data = parse(results_tag.replace("\n", newline))
+
+    assert data["mermin_energy"] == -8.12345678901234
+    assert data["total_energy"] == -8.12345678901235
+    assert data["energy"] == data["total_energy"]
+    assert data["n_iterations"].strip() == "7"
+    assert data["fermi_level"] == -0.15
+    assert data["forces"] == [[0.01, 0.02, -0.03], [-0.01, -0.02, 0.03]]
+    assert data["gradients"] == [[-0.01, -0.02, 0.03], [0.01, 0.02, -0.03]]
+    assert data["eigenvalues"] == [[[-0.5, 0.25]], [[-0.4, 0.35]]]
+    assert data["atom_types"] == ["1", "2", "2"]
+    assert data["model"] == "DFTB/3ob"
+
+
+def test_parse_results_short_block():
+    """A block with fewer values than its dimensions is an error."""
+    text = results_tag.replace("         1         2         2\n", "         1\n")
+    with pytest.raises(RuntimeError):
+        parse(text)
+
+
+def test_redimension():
+    """Values are in Fortran order, so the first dimension varies fastest."""
+    assert redimension([1.0, 2.0, 3.0], [3]) == [1.0, 2.0, 3.0]
+    assert redimension(list(range(6)), [3, 2]) == [[0, 1, 2], [3, 4, 5]]
+    assert redimension(list(range(8)), [2, 2, 2]) == [
+        [[0, 1], [2, 3]],
+        [[4, 5], [6, 7]],
+    ]
+    with pytest.raises(ValueError):
+        redimension([1.0, 2.0], [3])